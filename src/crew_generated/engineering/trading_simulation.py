@@ -44,14 +44,29 @@ Usage Example:
     print(transactions_df)
 """
 
+import sys
+import time
+from array import array
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal, getcontext
-from enum import Enum
+from enum import IntEnum
 from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels then run as plain NumPy.
+    def njit(*args, **kwargs):
+        """No-op stand-in for `numba.njit` when numba is not installed."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Set precision for Decimal calculations to handle financial data accurately.
 getcontext().prec = 28
 
@@ -85,13 +100,17 @@ class InvalidAmountError(TradingError):
 
 # --- Pydantic Data Models ---
 
-class TransactionType(str, Enum):
+class TransactionType(IntEnum):
     """Enumeration for the types of transactions possible."""
-    INITIALIZE = "INITIALIZE"
-    DEPOSIT = "DEPOSIT"
-    WITHDRAW = "WITHDRAW"
-    BUY = "BUY"
-    SELL = "SELL"
+    INITIALIZE = 0
+    DEPOSIT = 1
+    WITHDRAW = 2
+    BUY = 3
+    SELL = 4
+
+
+# Display names for `TransactionType`, indexed by value.
+_TX_NAMES = ("INITIALIZE", "DEPOSIT", "WITHDRAW", "BUY", "SELL")
 
 
 class Transaction(BaseModel):
@@ -127,13 +146,67 @@ _mock_prices = {
     "GOOGL": Decimal("130.00"),
 }
 
+# Integer-cent view of the mock prices, used by the batch valuation paths.
+_prices_upper: Dict[str, int] = {
+    symbol: int(price.scaleb(2)) for symbol, price in _mock_prices.items()
+}
+
+
+# Largest amount, in cents, the int64 ledger columns and valuation can hold.
+_MAX_CENTS = int(np.iinfo(np.int64).max)
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Converts a 2-dp Decimal amount into an integer number of cents."""
+    return int(amount.scaleb(2))
+
+
+def _checked_cents(amount: Decimal) -> int:
+    """
+    Like `_to_cents`, but rejects amounts the int64 ledger cannot store.
+
+    Raises:
+        InvalidAmountError: If the amount is out of the int64 cent range.
+    """
+    cents = _to_cents(amount)
+    if abs(cents) > _MAX_CENTS:
+        raise InvalidAmountError("Amount exceeds the maximum supported balance.")
+    return cents
+
+
+def _from_cents(cents: int) -> Decimal:
+    """Converts an integer number of cents back into a 2-dp Decimal."""
+    return Decimal(int(cents)).scaleb(-2)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_cents(cents: int) -> str:
+    """Formats an integer number of cents as a display currency string."""
+    return f"${cents / 100:,.2f}"
+
+
+@lru_cache(maxsize=4096)
+def _fmt_signed(cents: int, is_init: bool) -> str:
+    """
+    Formats a transaction's total value in cents for the history table.
+
+    Inflows other than the initial deposit are prefixed with "+", outflows
+    with "-".
+    """
+    if cents < 0:
+        return f"-{_fmt_cents(-cents)}"
+    if cents > 0 and not is_init:
+        return f"+{_fmt_cents(cents)}"
+    return _fmt_cents(cents)
+
 
 def get_share_price(symbol: str) -> Decimal:
     """
     Retrieves the current price for a given stock symbol from a mock source.
 
     Args:
-        symbol: The stock ticker symbol (e.g., 'AAPL').
+        symbol: The stock ticker symbol (e.g., 'AAPL'). Lookup is
+            case-insensitive, but upper-case symbols take the fast path.
 
     Raises:
         InvalidSymbolError: If the symbol is not found in the mock data.
@@ -141,12 +214,63 @@ def get_share_price(symbol: str) -> Decimal:
     Returns:
         The price of the share as a Decimal object.
     """
-    price = _mock_prices.get(symbol.upper())
-    if price is None:
+    # Internal callers normalize symbols at ingress, so try the key as given
+    # before paying for `.upper()`.
+    try:
+        return _mock_prices[symbol]
+    except KeyError:
+        pass
+    try:
+        return _mock_prices[symbol.upper()]
+    except KeyError:
         raise InvalidSymbolError(
             f"Could not fetch price for {symbol}. Please try again later."
-        )
-    return price
+        ) from None
+
+
+def _get_share_price_fast(symbol: str) -> Decimal:
+    """
+    Variant of `get_share_price` for symbols already normalized to upper case.
+
+    Skips case normalization entirely; used by the trading methods, which
+    upper-case the symbol once at ingress.
+    """
+    try:
+        return _mock_prices[symbol]
+    except KeyError:
+        raise InvalidSymbolError(
+            f"Could not fetch price for {symbol}. Please try again later."
+        ) from None
+
+
+@njit(cache=True)
+def _compute_valuation(prices, qtys, cash_cents, deposits_cents, withdrawals_cents):
+    """
+    Values a portfolio entirely in integer cents.
+
+    Args:
+        prices: int64 array of per-share prices, in cents.
+        qtys: int64 array of share quantities, aligned with `prices`.
+        cash_cents: The cash balance, in cents.
+        deposits_cents: Total deposits to date, in cents.
+        withdrawals_cents: Total withdrawals to date, in cents.
+
+    Returns:
+        A `(cash, holdings_value, portfolio_value, profit_loss)` tuple of
+        integer cent amounts.
+    """
+    holdings_value = np.sum(prices * qtys)
+    portfolio_value = cash_cents + holdings_value
+    profit_loss = portfolio_value - deposits_cents + withdrawals_cents
+    return cash_cents, holdings_value, portfolio_value, profit_loss
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ns_to_datetime(ns: int) -> datetime:
+    """Converts a `time.time_ns()` stamp into a naive UTC datetime."""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
 
 
 # --- Primary Simulation Class ---
@@ -161,15 +285,73 @@ class TradingSimulation:
     returning structured `ServiceResponse` objects.
     """
 
+    _HOLDINGS_COLUMNS = ["Symbol", "Quantity", "Current Price", "Market Value"]
+    _TRANSACTIONS_COLUMNS = [
+        "Timestamp", "Type", "Symbol", "Quantity", "Price/Share", "Total Value"
+    ]
+
     def __init__(self) -> None:
         """Initializes an empty and uninitialized trading account."""
         self.cash_balance: Decimal = Decimal("0.0")
         self.holdings: Dict[str, int] = {}
-        self.transactions: List[Transaction] = []
         self.total_deposits: Decimal = Decimal("0.0")
         self.total_withdrawals: Decimal = Decimal("0.0")
         self.initialized: bool = False
 
+        # Transaction history is stored column-wise. Timestamps are raw
+        # `time.time_ns()` integers; `Transaction` objects are only built
+        # when the `transactions` property is read.
+        self._tx_ts = array("q")
+        self._tx_type = array("b")
+        self._tx_symbol: List[Optional[str]] = []
+        # Prices and values are integer cents. A quantity or price of 0
+        # means the transaction has none (cash-only transactions).
+        self._tx_qty = array("q")
+        self._tx_price = array("q")
+        self._tx_value = array("q")
+
+    @property
+    def transactions(self) -> List[Transaction]:
+        """The account history as `Transaction` models, oldest first."""
+        # Every field comes from the ledger, timestamp included, so the models
+        # are built without validation and never hit `default_factory`.
+        return [
+            Transaction.model_construct(
+                timestamp=_ns_to_datetime(ts),
+                type=TransactionType(tx_type),
+                symbol=symbol,
+                quantity=quantity or None,
+                price_per_share=_from_cents(price) if price else None,
+                total_value=_from_cents(value),
+            )
+            for ts, tx_type, symbol, quantity, price, value in zip(
+                self._tx_ts, self._tx_type, self._tx_symbol,
+                self._tx_qty, self._tx_price, self._tx_value,
+            )
+        ]
+
+    def _record(
+        self,
+        tx_type: TransactionType,
+        total_value: Decimal,
+        symbol: Optional[str] = None,
+        quantity: Optional[int] = None,
+        price_per_share: Optional[Decimal] = None,
+    ) -> None:
+        """Appends a single transaction to the columnar history."""
+        # Convert everything before touching a column so a failure can never
+        # leave the columns with different lengths.
+        price_cents = (
+            _checked_cents(price_per_share) if price_per_share is not None else 0
+        )
+        value_cents = _checked_cents(total_value)
+        self._tx_ts.append(time.time_ns())
+        self._tx_type.append(tx_type)
+        self._tx_symbol.append(symbol)
+        self._tx_qty.append(quantity or 0)
+        self._tx_price.append(price_cents)
+        self._tx_value.append(value_cents)
+
     def initialize(self, deposit_amount: float) -> ServiceResponse:
         """
         Initializes the account with a starting cash balance.
@@ -188,19 +370,23 @@ class TradingSimulation:
             return ServiceResponse(
                 success=False, message="Account already initialized."
             )
-        if not isinstance(deposit_amount, (int, float)) or deposit_amount <= 0:
+        if not (type(deposit_amount) in (int, float) and deposit_amount > 0):
             return ServiceResponse(
                 success=False,
                 message="Initial deposit must be a positive number."
             )
 
         amount = Decimal(str(deposit_amount)).quantize(Decimal("0.01"))
+        try:
+            _checked_cents(amount)
+        except InvalidAmountError as e:
+            return ServiceResponse(success=False, message=str(e))
+
         self.cash_balance = amount
         self.total_deposits = amount
         self.initialized = True
 
-        tx = Transaction(type=TransactionType.INITIALIZE, total_value=amount)
-        self.transactions.append(tx)
+        self._record(TransactionType.INITIALIZE, amount)
 
         return ServiceResponse(
             success=True,
@@ -218,15 +404,18 @@ class TradingSimulation:
             A ServiceResponse indicating success or failure.
         """
         try:
-            if not isinstance(amount, (int, float)) or amount <= 0:
+            if not (type(amount) in (int, float) and amount > 0):
                 raise InvalidAmountError("Amount must be a positive number.")
 
             dec_amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+            # Cash, holdings value and every ledger amount are bounded by total
+            # deposits (prices are fixed), so checking it keeps them all in range.
+            _checked_cents(self.total_deposits + dec_amount)
+
             self.cash_balance += dec_amount
             self.total_deposits += dec_amount
 
-            tx = Transaction(type=TransactionType.DEPOSIT, total_value=dec_amount)
-            self.transactions.append(tx)
+            self._record(TransactionType.DEPOSIT, dec_amount)
 
             return ServiceResponse(
                 success=True,
@@ -246,7 +435,7 @@ class TradingSimulation:
             A ServiceResponse indicating success or failure.
         """
         try:
-            if not isinstance(amount, (int, float)) or amount <= 0:
+            if not (type(amount) in (int, float) and amount > 0):
                 raise InvalidAmountError("Amount must be a positive number.")
 
             dec_amount = Decimal(str(amount)).quantize(Decimal("0.01"))
@@ -259,8 +448,7 @@ class TradingSimulation:
             self.cash_balance -= dec_amount
             self.total_withdrawals += dec_amount
 
-            tx = Transaction(type=TransactionType.WITHDRAW, total_value=-dec_amount)
-            self.transactions.append(tx)
+            self._record(TransactionType.WITHDRAW, -dec_amount)
 
             return ServiceResponse(
                 success=True,
@@ -284,12 +472,15 @@ class TradingSimulation:
             A ServiceResponse indicating success or failure.
         """
         try:
-            if not isinstance(quantity, int) or quantity <= 0:
+            if not (type(quantity) is int and quantity > 0):
                 raise InvalidAmountError("Quantity must be a positive integer.")
 
-            upper_symbol = symbol.upper()
-            price_per_share = get_share_price(upper_symbol)
-            total_cost = (price_per_share * quantity).quantize(Decimal("0.01"))
+            # Interned so every ledger row for a ticker shares one string.
+            upper_symbol = sys.intern(symbol.upper())
+            price_per_share = _get_share_price_fast(upper_symbol)
+            # Prices are stored at 2 dp and quantity is an int, so the product
+            # is already at cent precision and needs no quantize.
+            total_cost = price_per_share * quantity
 
             if total_cost > self.cash_balance:
                 raise InsufficientFundsError(
@@ -299,16 +490,18 @@ class TradingSimulation:
 
             # --- Atomic State Modification ---
             self.cash_balance -= total_cost
-            self.holdings[upper_symbol] = self.holdings.get(upper_symbol, 0) + quantity
+            try:
+                self.holdings[upper_symbol] += quantity
+            except KeyError:
+                self.holdings[upper_symbol] = quantity
 
-            tx = Transaction(
-                type=TransactionType.BUY,
+            self._record(
+                TransactionType.BUY,
+                -total_cost,
                 symbol=upper_symbol,
                 quantity=quantity,
                 price_per_share=price_per_share,
-                total_value=-total_cost,
             )
-            self.transactions.append(tx)
 
             return ServiceResponse(
                 success=True,
@@ -333,10 +526,10 @@ class TradingSimulation:
             A ServiceResponse indicating success or failure.
         """
         try:
-            if not isinstance(quantity, int) or quantity <= 0:
+            if not (type(quantity) is int and quantity > 0):
                 raise InvalidAmountError("Quantity must be a positive integer.")
 
-            upper_symbol = symbol.upper()
+            upper_symbol = sys.intern(symbol.upper())
             current_holding = self.holdings.get(upper_symbol, 0)
             if quantity > current_holding:
                 raise InsufficientHoldingsError(
@@ -344,23 +537,25 @@ class TradingSimulation:
                     f"{upper_symbol}. You only own {current_holding}."
                 )
 
-            price_per_share = get_share_price(upper_symbol)
-            total_proceeds = (price_per_share * quantity).quantize(Decimal("0.01"))
+            price_per_share = _get_share_price_fast(upper_symbol)
+            total_proceeds = price_per_share * quantity
 
             # --- Atomic State Modification ---
             self.cash_balance += total_proceeds
-            self.holdings[upper_symbol] -= quantity
-            if self.holdings[upper_symbol] == 0:
+            # `current_holding` was read above; reuse it rather than re-probing.
+            remaining = current_holding - quantity
+            if remaining:
+                self.holdings[upper_symbol] = remaining
+            else:
                 del self.holdings[upper_symbol]
 
-            tx = Transaction(
-                type=TransactionType.SELL,
+            self._record(
+                TransactionType.SELL,
+                total_proceeds,
                 symbol=upper_symbol,
                 quantity=quantity,
                 price_per_share=price_per_share,
-                total_value=total_proceeds,
             )
-            self.transactions.append(tx)
 
             return ServiceResponse(
                 success=True,
@@ -378,27 +573,30 @@ class TradingSimulation:
             A PortfolioMetrics object containing the current state of the
             account's performance.
         """
-        total_holdings_value = Decimal("0.0")
-        for symbol, quantity in self.holdings.items():
-            try:
-                price = get_share_price(symbol)
-                total_holdings_value += price * quantity
-            except InvalidSymbolError:
-                # Per requirements, assume prices are available for owned stocks.
-                # In a real system, this might be handled by using the last
-                # known price or marking the holding as having a stale price.
-                pass
-
-        total_portfolio_value = self.cash_balance + total_holdings_value
-        profit_loss = (
-            total_portfolio_value - self.total_deposits + self.total_withdrawals
+        symbols = list(self.holdings)
+        qtys = np.fromiter(
+            self.holdings.values(), dtype=np.int64, count=len(self.holdings)
+        )
+        # Per requirements, assume prices are available for owned stocks.
+        # Unknown symbols contribute nothing, matching the previous behaviour.
+        prices = np.fromiter(
+            (_prices_upper.get(s, 0) for s in symbols),
+            dtype=np.int64,
+            count=len(symbols),
+        )
+        cash, holdings_value, portfolio_value, profit_loss = _compute_valuation(
+            prices,
+            qtys,
+            _to_cents(self.cash_balance),
+            _to_cents(self.total_deposits),
+            _to_cents(self.total_withdrawals),
         )
 
         return PortfolioMetrics(
-            cash_balance=self.cash_balance.quantize(Decimal("0.01")),
-            total_holdings_value=total_holdings_value.quantize(Decimal("0.01")),
-            total_portfolio_value=total_portfolio_value.quantize(Decimal("0.01")),
-            profit_loss=profit_loss.quantize(Decimal("0.01")),
+            cash_balance=_from_cents(cash),
+            total_holdings_value=_from_cents(holdings_value),
+            total_portfolio_value=_from_cents(portfolio_value),
+            profit_loss=_from_cents(profit_loss),
         )
 
     def get_holdings_df(self) -> pd.DataFrame:
@@ -411,29 +609,35 @@ class TradingSimulation:
         Returns:
             A Pandas DataFrame of current stock holdings.
         """
-        data = []
-        for symbol, quantity in sorted(self.holdings.items()):
-            try:
-                price = get_share_price(symbol)
-                market_value = price * quantity
-                data.append({
-                    "Symbol": symbol,
-                    "Quantity": quantity,
-                    "Current Price": f"${price:,.2f}",
-                    "Market Value": f"${market_value:,.2f}",
-                })
-            except InvalidSymbolError:
-                data.append({
-                    "Symbol": symbol,
-                    "Quantity": quantity,
-                    "Current Price": "N/A",
-                    "Market Value": "N/A",
-                })
-
-        columns = ["Symbol", "Quantity", "Current Price", "Market Value"]
-        if not data:
-            return pd.DataFrame(columns=columns)
-        return pd.DataFrame(data, columns=columns)
+        if not self.holdings:
+            return pd.DataFrame(columns=self._HOLDINGS_COLUMNS)
+
+        symbols = sorted(self.holdings)
+        qtys = np.fromiter(
+            (self.holdings[s] for s in symbols), dtype=np.int64, count=len(symbols)
+        )
+        # -1 marks a symbol without a known price; it is rendered as "N/A".
+        prices = np.fromiter(
+            (_prices_upper.get(s, -1) for s in symbols),
+            dtype=np.int64,
+            count=len(symbols),
+        )
+        priced = prices >= 0
+
+        price_col = pd.Series(prices).map(_fmt_cents)
+        value_col = pd.Series(prices * qtys).map(_fmt_cents)
+        price_col[~priced] = "N/A"
+        value_col[~priced] = "N/A"
+
+        return pd.DataFrame(
+            {
+                "Symbol": symbols,
+                "Quantity": qtys,
+                "Current Price": price_col,
+                "Market Value": value_col,
+            },
+            columns=self._HOLDINGS_COLUMNS,
+        )
 
     def get_transactions_df(self) -> pd.DataFrame:
         """
@@ -445,30 +649,37 @@ class TradingSimulation:
         Returns:
             A Pandas DataFrame of the account's transaction history.
         """
-        data = []
-        for tx in reversed(self.transactions):
-            total_value_str = f"{tx.total_value:,.2f}"
-            if tx.total_value > 0 and tx.type != TransactionType.INITIALIZE:
-                total_value_str = f"+${total_value_str}"
-            elif tx.total_value < 0:
-                total_value_str = f"-${abs(tx.total_value):,.2f}"
-            else:
-                total_value_str = f"${total_value_str}"
-
-            data.append({
-                "Timestamp": tx.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                "Type": tx.type.value,
-                "Symbol": tx.symbol or "N/A",
-                "Quantity": tx.quantity or "N/A",
-                "Price/Share": (
-                    f"${tx.price_per_share:,.2f}" if tx.price_per_share else "N/A"
+        if not self._tx_ts:
+            return pd.DataFrame(columns=self._TRANSACTIONS_COLUMNS)
+
+        # Build each column straight from the ledger, most recent first.
+        timestamps = pd.to_datetime(
+            np.array(self._tx_ts, dtype=np.int64)[::-1], unit="ns"
+        ).strftime("%Y-%m-%d %H:%M:%S")
+        types = np.array(self._tx_type, dtype=np.int8)[::-1]
+        qtys = np.array(self._tx_qty, dtype=np.int64)[::-1]
+        prices = np.array(self._tx_price, dtype=np.int64)[::-1]
+        values = np.array(self._tx_value, dtype=np.int64)[::-1]
+
+        quantity_col = qtys.astype(object)
+        quantity_col[qtys == 0] = "N/A"
+
+        return pd.DataFrame(
+            {
+                "Timestamp": timestamps,
+                "Type": np.array(_TX_NAMES, dtype=object)[types],
+                "Symbol": pd.Categorical(
+                    [symbol or "N/A" for symbol in self._tx_symbol[::-1]]
                 ),
-                "Total Value": total_value_str,
-            })
-
-        columns = [
-            "Timestamp", "Type", "Symbol", "Quantity", "Price/Share", "Total Value"
-        ]
-        if not data:
-            return pd.DataFrame(columns=columns)
-        return pd.DataFrame(data, columns=columns)
\ No newline at end of file
+                "Quantity": quantity_col,
+                "Price/Share": pd.Series(prices).map(_fmt_cents).where(
+                    prices > 0, "N/A"
+                ),
+                "Total Value": list(map(
+                    _fmt_signed,
+                    values.tolist(),
+                    (types == TransactionType.INITIALIZE).tolist(),
+                )),
+            },
+            columns=self._TRANSACTIONS_COLUMNS,
+        )
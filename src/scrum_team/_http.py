@@ -0,0 +1,15 @@
+import atexit
+import importlib.util
+
+import httpx
+
+# One pooled client for every Gemini LLM in the process. Crews run their LLM
+# calls from worker threads (Crew.kickoff_async is asyncio.to_thread), which
+# share a sync httpx.Client safely; an AsyncClient would be tied to whichever
+# event loop first used it. HTTP/2 needs h2 (the "http2" extra).
+SHARED_CLIENT = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=httpx.Timeout(600.0, connect=10.0),
+)
+atexit.register(SHARED_CLIENT.close)
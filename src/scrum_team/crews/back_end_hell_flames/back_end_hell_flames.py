@@ -1,8 +1,7 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task,llm
-from crewai import LLM
+from scrum_team.llms import gemini_llm
 from crewai.tasks.task_output import TaskOutput
-import os
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 import re
@@ -21,24 +20,14 @@ class BackEndHellFlames():
         # Best config for complex code implementation:
         # - Temperature 0.1: Low creativity, high precision for following technical specs
         # - Top_p 0.95: Standard setting for reasoning and code generation
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.1, 
-            top_p=0.95
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-preview-09-2025", 0.1, 0.95)
     
     @llm
     def gemini_flash_lite(self):
         # Best config for code cleanup:
         # - Temperature 0.0: Ensures deterministic output (no creativity/hallucinations)
         # - Top_p 0.1: Restricts to only the most probable tokens (exact code reproduction)
-        return LLM(
-            model="gemini/gemini-2.5-flash-lite",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.0, 
-            top_p=0.1
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-lite", 0.0, 0.1)
 
     @agent
     def backend_dev_hell_flames(self) -> Agent:
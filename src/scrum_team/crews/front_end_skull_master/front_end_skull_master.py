@@ -1,7 +1,6 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task, llm
-from crewai import LLM
-import os
+from scrum_team.llms import gemini_llm
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 # If you want to run a snippet of code before or after the crew starts,
@@ -21,24 +20,14 @@ class FrontEndSkullMaster():
         # - Temperature 0.2: Slightly higher than backend to allow for creative UI layout solutions, 
         #   but still low enough to ensure correct API usage and code structure.
         # - Top_p 0.9: Standard setting for balanced generation.
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.2, 
-            top_p=0.9
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-preview-09-2025", 0.2, 0.9)
 
     @llm
     def gemini_flash_lite(self):
         # Best config for code cleanup:
         # - Temperature 0.0: Ensures deterministic output (no creativity/hallucinations)
         # - Top_p 0.1: Restricts to only the most probable tokens (exact code reproduction)
-        return LLM(
-            model="gemini/gemini-2.5-flash-lite",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.0, 
-            top_p=0.1
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-lite", 0.0, 0.1)
 
     @agent
     def frontend_dev_skull_master(self) -> Agent:
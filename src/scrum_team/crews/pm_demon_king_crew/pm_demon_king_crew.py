@@ -1,8 +1,12 @@
-from crewai import LLM, Agent, Crew, Process, Task
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task, llm
+from scrum_team.llms import gemini_llm
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.memory import LongTermMemory
+from crewai.utilities.paths import db_storage_path
 from typing import List
-import os
+from pathlib import Path
+import hashlib
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -16,12 +20,7 @@ class PmDemonKingCrew():
 
     @llm
     def pm_llm(self):
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.6, 
-            top_p=0.9
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-preview-09-2025", 0.6, 0.9)
 
     @agent
     def product_manager(self) -> Agent:
@@ -43,11 +42,34 @@ class PmDemonKingCrew():
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
-        return Crew(
+        # Memory lives on disk under CREWAI_STORAGE_DIR (SQLite for long-term,
+        # Chroma for short-term/entity), so parallel flows and restarts share it.
+        storage_dir = Path(db_storage_path())
+        crew = Crew(
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             memory=True,
+            long_term_memory=LongTermMemory(
+                path=str(storage_dir / "pm_long_term_memory.db")
+            ),
             verbose=True,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
+        return crew
+
+    @staticmethod
+    def before_run(crew: Crew, inputs: dict) -> None:
+        """Reset memories when the requirements differ from the previous run's.
+
+        Called by the flow before every kickoff (the crew itself is built once
+        per process), with the requirements text the flow actually read.
+        """
+        digest = hashlib.sha256(inputs.get("requirements", "").encode("utf-8")).hexdigest()
+        marker = Path(db_storage_path()) / "pm_requirements.sha256"
+        if marker.exists() and marker.read_text() == digest:
+            return
+        if marker.exists():
+            for memory_type in ("short", "long", "entity"):
+                crew.reset_memories(memory_type)
+        marker.write_text(digest)
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 
 class TestStep(BaseModel):
     """Represents a single test step with action and expected outcome"""
+    model_config = ConfigDict(frozen=True)
+
     step_number: int = Field(description="Sequential step number starting from 1")
     action: str = Field(description="The action to perform in this step")
     expected_outcome: str = Field(description="The expected result after performing this action")
@@ -11,6 +13,8 @@ class TestStep(BaseModel):
 
 class TestScenario(BaseModel):
     """Represents a single test scenario with all necessary details for test generation"""
+    model_config = ConfigDict(frozen=True)
+
     test_id: str = Field(
         description="Unique test scenario identifier (e.g., TS-1.1, TS-2.3)"
     )
@@ -33,6 +37,8 @@ class TestScenario(BaseModel):
 
 class TestPlanStructured(BaseModel):
     """Complete structured test plan containing all test scenarios"""
+    model_config = ConfigDict(frozen=True)
+
     module_name: str = Field(
         description="Name of the module being tested (e.g., trading_simulation, account_management)"
     )
@@ -1,9 +1,9 @@
-import os
-from crewai import LLM, Agent, Crew, Process, Task
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task, llm
+from scrum_team.llms import gemini_llm
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
-from mcp import StdioServerParameters
+from scrum_team import playwright_mcp
 from crewai_tools import MCPServerAdapter
 from .models import TestPlanStructured
 
@@ -22,22 +22,14 @@ class QaLeadEvil():
     #     )
     # ]
 
-    mcp_server_params = [
-        # Playwright MCP Server with headless mode
-        StdioServerParameters(
-            command="npx",
-            args=["playwright", "run-test-mcp-server", "--headless"],
-        )
-    ]
+    @property
+    def mcp_server_params(self):
+        # Shared headless Playwright MCP server, started once per process on first use
+        return playwright_mcp.server_params()
 
     @llm
     def qa_plan_llm(self):
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.6, 
-            top_p=0.9
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-preview-09-2025", 0.6, 0.9)
 
     @agent
     def qa_lead_evil_tester(self) -> Agent:
@@ -1,6 +1,6 @@
-from crewai import Agent, Crew, Process, Task, LLM
-import os
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task,llm
+from scrum_team.llms import gemini_llm
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 # If you want to run a snippet of code before or after the crew starts,
@@ -16,12 +16,7 @@ class TechLeadDevilCrew():
 
     @llm
     def gemini_creative(self):
-        return LLM(
-            model="gemini/gemini-2.5-flash-preview-09-2025",
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            temperature=0.3, 
-            top_p=0.9
-        )
+        return gemini_llm("gemini/gemini-2.5-flash-preview-09-2025", 0.3, 0.9)
 
     @agent
     def engineering_lead(self) -> Agent:
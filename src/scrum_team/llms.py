@@ -0,0 +1,22 @@
+import os
+from functools import cache
+
+from crewai import LLM
+
+from scrum_team._http import SHARED_CLIENT
+
+
+@cache
+def gemini_llm(model: str, temperature: float, top_p: float) -> LLM:
+    """Return the shared LLM for this model and sampling config.
+
+    Every crew that asks for the same settings gets the same instance, and all
+    instances send requests through the shared pooled HTTP client.
+    """
+    return LLM(
+        model=model,
+        api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=temperature,
+        top_p=top_p,
+        client_params={"http_options": {"httpx_client": SHARED_CLIENT}},
+    )
@@ -1,23 +1,241 @@
 #!/usr/bin/env python
-from random import randint
 import os
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
 import re
-from crewai.flow import Flow, listen, start
-import subprocess
+from crewai.flow import Flow, and_, listen, start
 import time
-import requests
+import weakref
+import httpx
+import hashlib
 import json
-from typing import List, Optional
-
-from scrum_team.crews.pm_demon_king_crew.pm_demon_king_crew import PmDemonKingCrew
-from scrum_team.crews.tech_lead_devil_crew.tech_lead_devil_crew import TechLeadDevilCrew
-from scrum_team.crews.back_end_hell_flames.back_end_hell_flames import BackEndHellFlames
-from scrum_team.crews.front_end_skull_master.front_end_skull_master import FrontEndSkullMaster
-from scrum_team.crews.qa_lead_evil.qa_lead_evil import QaLeadEvil
-from scrum_team.crews.playwright_qa_demon.playwright_qa_demon import PlaywrightQaDemon
+from functools import cache, lru_cache
+import asyncio
+import atexit
+import importlib
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json handles the same payloads
+    orjson = None
+
+from scrum_team import result_cache, state_snapshot
+# Crew modules pull in crewai_tools/MCP and are imported where they are used.
 from scrum_team.crews.qa_lead_evil.models import TestPlanStructured, TestScenario, TestStep
 
+# Fixed name rather than __name__: run as a script this module is "__main__",
+# which would fall outside the "scrum_team" logger configure_logging sets up.
+logger = logging.getLogger("scrum_team.main")
+
+
+def configure_logging() -> None:
+    """Send scrum_team log records to stdout through a queue.
+
+    Flow stages only enqueue records; a listener thread does the blocking
+    stdout writes, so concurrent stages never contend on the stream lock.
+    Stage outputs are logged at DEBUG (SCRUM_LOG_LEVEL=DEBUG to see them).
+    """
+    package_logger = logging.getLogger("scrum_team")
+    if any(isinstance(h, QueueHandler) for h in package_logger.handlers):
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    package_logger.addHandler(QueueHandler(log_queue))
+    package_logger.setLevel(os.getenv("SCRUM_LOG_LEVEL", "INFO").upper())
+    package_logger.propagate = False
+
+
+@lru_cache(maxsize=32)
+def _read_doc(path: str, mtime: float) -> str:
+    """Read a UTF-8 doc. Keyed on mtime so an edited file is re-read."""
+    return Path(path).read_bytes().decode("utf-8")
+
+
+def read_doc(path: str) -> str:
+    """Read a doc from disk, reusing the cached content while it is unchanged."""
+    return _read_doc(path, os.stat(path).st_mtime)
+
+
+def _read_doc_if_exists(path: str) -> Optional[str]:
+    try:
+        return read_doc(path)
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _parse_test_plan(path: str, mtime: float) -> TestPlanStructured:
+    """Validate the test plan JSON once per file version; the models are frozen so it is safe to share."""
+    # model_validate_json parses and validates in pydantic-core in one pass. It
+    # is several times faster than json.loads + nested model_construct for this
+    # plan, so the "trusted input" shortcut is deliberately not used here.
+    return TestPlanStructured.model_validate_json(_read_doc(path, mtime))
+
+
+def _load_test_plan_if_exists(path: str) -> Optional[TestPlanStructured]:
+    try:
+        return _parse_test_plan(path, os.stat(path).st_mtime)
+    except FileNotFoundError:
+        return None
+
+
+@cache
+def _crew_template(crew_class: type):
+    """Build a crew once per process so its YAML config and LLM are set up only once."""
+    return crew_class().crew()
+
+
+def get_crew(crew_class: type):
+    """Return a fresh copy of the cached crew; copies can be kicked off concurrently.
+
+    Crews wired to an MCP server are not cached here: CrewAI stops the server
+    after each kickoff, so those are still built per run.
+    """
+    return _crew_template(crew_class).copy()
+
+
+# Cap on crews talking to the LLM at once across the whole flow. asyncio
+# primitives belong to one event loop, so each loop gets its own semaphore.
+LLM_MAX_CONCURRENCY = int(os.getenv("CREW_MAX_CONCURRENCY", "4"))
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """True for HTTP 429s from google-genai (.code) or OpenAI/LiteLLM style errors."""
+    return (
+        429 in (getattr(exc, "code", None), getattr(exc, "status_code", None))
+        or "RateLimit" in type(exc).__name__
+    )
+
+
+async def _gated_kickoff(crew, inputs: dict, retries: int = 3):
+    """Kick off a crew under the LLM concurrency cap, backing off on rate limits.
+
+    A rate-limited call keeps its slot while it waits, so the other crews are
+    not let in to make the 429s worse.
+    """
+    delay = 5.0
+    async with _llm_semaphore():
+        for attempt in range(retries + 1):
+            try:
+                return await crew.kickoff_async(inputs=inputs)
+            except Exception as e:
+                if attempt == retries or not _is_rate_limited(e):
+                    raise
+                logger.warning("  - Rate limited, retrying in %.1f seconds: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay *= 1.3
+
+
+async def cached_kickoff(crew_class: type, inputs: dict, output_file: Optional[str] = None):
+    """Kick off a copy of the crew unless these exact inputs and crew config ran recently.
+
+    The result cache is off unless SCRUM_RESULT_CACHE_TTL is set. On a hit the
+    cached text is returned (and rewritten to output_file, which the crew's
+    task would otherwise have produced) without calling the LLM.
+    """
+    key = result_cache.cache_key(crew_class.__name__, inputs, result_cache.crew_fingerprint(crew_class))
+    raw = result_cache.get(key)
+    if raw is not None:
+        logger.warning(
+            "  - Reusing cached %s result for unchanged inputs and config (unset SCRUM_RESULT_CACHE_TTL to disable)",
+            crew_class.__name__,
+        )
+        if output_file:
+            Path(output_file).write_text(raw, encoding="utf-8")
+        return result_cache.CachedCrewOutput(raw)
+
+    crew = get_crew(crew_class)
+    # Optional per-run hook on the crew class, e.g. resetting stale memories
+    before_run = getattr(crew_class, "before_run", None)
+    if before_run is not None:
+        await asyncio.to_thread(before_run, crew, inputs)
+    result = await _gated_kickoff(crew, inputs)
+    result_cache.put(key, result.raw)
+    return result
+
+
+# Keeps the app output drain tasks referenced until they finish
+_background_tasks = set()
+
+
+async def _drain_stream(stream: asyncio.StreamReader, tail: Optional[deque] = None) -> None:
+    """Read a subprocess pipe to EOF, logging each line at DEBUG."""
+    async for line in stream:
+        text = line.decode("utf-8", errors="replace").rstrip()
+        logger.debug("[app] %s", text)
+        if tail is not None:
+            tail.append(text)
+
+
+async def _port_accepting(host: str, port: int) -> bool:
+    """True if a TCP connection to host:port succeeds within a quarter second."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 0.25)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    await writer.wait_closed()
+    return True
+
+
+# Used by ScrumFlow._save_code_to_file to clean up LLM code output
+_THOUGHT_RE = re.compile(r'^Thought:.*$', re.MULTILINE)
+# Matches ```python ... ``` or ``` ... ```
+_FENCE_RE = re.compile(r"```(?:python|py)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+# Leading lines that are not code: blank lines, "Thought:" lines, a bare
+# "filename.py" and conversational openers like "Here is the code"
+_LEADING_FILLER_RE = re.compile(
+    r"(?:[^\S\n]*"
+    r"(?:Thought:.*|\S*\.py|(?i:here is|sure|the code|below is|i have|creating|implementing).*)?"
+    r"[^\S\n]*(?:\n|\Z))*"
+)
+_STORY_HEADING_RE = re.compile(r"^#{2,4} \**(US-\d+)", re.MULTILINE)
+
+
+# Story id used when the PM's markdown has no US-xxx headings to split on
+ALL_STORIES_ID = "US-ALL"
+
+
+def split_user_stories(markdown: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Split the PM's markdown into its preamble and (story_id, text) pairs.
+
+    The preamble is everything before the first US-xxx heading (summary,
+    glossary, flows, NFRs...). Without any headings the whole document is a
+    single ALL_STORIES_ID story and the preamble is empty.
+    """
+    matches = list(_STORY_HEADING_RE.finditer(markdown))
+    if not matches:
+        return "", [(ALL_STORIES_ID, markdown)]
+    bounds = [m.start() for m in matches] + [len(markdown)]
+    return markdown[:bounds[0]].strip(), [
+        (m.group(1), markdown[bounds[i]:bounds[i + 1]].strip())
+        for i, m in enumerate(matches)
+    ]
+
+
 class ScrumState(BaseModel):
     module_name: str = "trading_simulation"
     class_name: str = "TradingSimulation"
@@ -26,359 +244,528 @@ class ScrumState(BaseModel):
     technical_design_created: str = ""
     backend_module_implemented: str = ""
     frontend_module_implemented: str = ""
-    test_plan_created: str = ""
     test_plan_structured: Optional[TestPlanStructured] = None
     playwright_tests_generated: List[str] = []
     application_url: str = "http://127.0.0.1:7860/"
+    max_parallel_generations: int = 3
+    # How many test plan scenarios get a Playwright test per run
+    max_scenarios: int = Field(default_factory=lambda: int(os.getenv("PW_MAX_SCENARIOS", "2")))
+    # Where each stage's task writes its artifact (see output_file in the crew configs)
+    requirements_path: str = "docs/requirements.md"
+    user_stories_path: str = "docs/crew/trading_simulation_user_stories.md"
+    technical_design_path: str = "docs/crew/trading_simulation_technical_design.md"
+    test_plan_path: str = "docs/crew/trading_simulation_test_plan.json"
+
+@dataclass(frozen=True)
+class Stage:
+    """One LLM stage of the pipeline, described as data."""
+    crew: str  # "<module under scrum_team.crews>:<CrewClass>", imported on first use
+    icon: str
+    agent_name: str
+    start_message: str
+    done_message: str
+    inputs: Dict[str, str]  # kickoff input name -> ScrumState field
+    output: str  # ScrumState field that receives result.raw
+    output_file: Optional[str] = None  # ScrumState field with the task's output_file
+
+    def crew_class(self) -> type:
+        module_name, class_name = self.crew.split(":")
+        return getattr(importlib.import_module(f"scrum_team.crews.{module_name}"), class_name)
+
+
+STAGES: Dict[str, Stage] = {
+    "generate_user_stories": Stage(
+        crew="pm_demon_king_crew.pm_demon_king_crew:PmDemonKingCrew",
+        icon="👹👹👹👹👹👹👹👹",
+        agent_name="Demon King PM",
+        start_message="Generating user stories",
+        done_message="User stories generated",
+        inputs={"requirements": "requirements"},
+        output="user_stories_created",
+        output_file="user_stories_path",
+    ),
+    "create_technical_design": Stage(
+        crew="tech_lead_devil_crew.tech_lead_devil_crew:TechLeadDevilCrew",
+        icon="😈😈😈😈😈😈😈😈",
+        agent_name="Tech Lead Devil",
+        start_message="Creating technical design",
+        done_message="Technical design created",
+        inputs={
+            "user_stories": "user_stories_created",
+            "requirements": "requirements",
+            "module_name": "module_name",
+            "class_name": "class_name",
+        },
+        output="technical_design_created",
+        output_file="technical_design_path",
+    ),
+    "implement_backend_module": Stage(
+        crew="back_end_hell_flames.back_end_hell_flames:BackEndHellFlames",
+        icon="🔥🔥🔥🔥🔥🔥🔥🔥",
+        agent_name="Backend Dev Hell Flames",
+        start_message="Implementing backend module",
+        done_message="Backend module implemented",
+        inputs={
+            "technical_design": "technical_design_created",
+            "user_stories": "user_stories_created",
+            "module_name": "module_name",
+            "class_name": "class_name",
+        },
+        output="backend_module_implemented",
+    ),
+    "implement_frontend_module": Stage(
+        crew="front_end_skull_master.front_end_skull_master:FrontEndSkullMaster",
+        icon="💀💀💀💀💀💀💀💀",
+        agent_name="Frontend Dev Skull Master",
+        start_message="Implementing frontend module",
+        done_message="Frontend module implemented",
+        inputs={
+            "backend_module": "backend_module_implemented",
+            "technical_design": "technical_design_created",
+            "user_stories": "user_stories_created",
+            "module_name": "module_name",
+            "class_name": "class_name",
+        },
+        output="frontend_module_implemented",
+    ),
+}
 
 class ScrumFlow(Flow[ScrumState]):
-    # @start()
-    # def generate_user_stories(self, crewai_trigger_payload: dict = None):
-    #     pm_icon = "👹👹👹👹👹👹👹👹"
-    #     pm_agent_name = f"Demon King PM"
-    #     print(f"{pm_icon} {pm_agent_name} Generating user stories {pm_icon}")
-    #     with open(f"docs/requirements.md", "r", encoding="utf-8") as f:
-    #         requirements = f.read()
-    #     self.state.requirements = requirements
-    #     result = (
-    #         PmDemonKingCrew()
-    #         .crew()
-    #         .kickoff(inputs={
-    #             "requirements": self.state.requirements,
-    #         })
-    #     )
-
-    #     print(f"{pm_icon} {pm_agent_name} User stories generated{pm_icon}", result.raw)
-    #     self.state.user_stories_created = result.raw
-
-    # @listen(generate_user_stories)
-    # def create_technical_design(self):
-    #     tl_icon = "😈😈😈😈😈😈😈😈"
-    #     tl_agent_name = f"Tech Lead Devil"
-    #     print(f"{tl_icon} {tl_agent_name} Creating technical design {tl_icon}")
-    #     result = (
-    #         TechLeadDevilCrew()
-    #         .crew()
-    #         .kickoff(inputs={
-    #             "user_stories": self.state.user_stories_created,
-    #             "requirements": self.state.requirements,
-    #             "module_name": self.state.module_name,
-    #             "class_name": self.state.class_name,
-    #             })
-    #     )
-
-    #     print(f"{tl_icon} {tl_agent_name} Technical design created {tl_icon}", result.raw)
-    #     self.state.technical_design_created = result.raw
-
-    # @listen(create_technical_design)
-    # def implement_backend_module(self):
-    #     be_icon = "🔥🔥🔥🔥🔥🔥🔥🔥"
-    #     be_agent_name = f"Backend Dev Hell Flames"
-    #     print(f"{be_icon} {be_agent_name} Implementing backend module {be_icon}")
-    #     result = (
-    #         BackEndHellFlames()
-    #         .crew()
-    #         .kickoff(inputs={
-    #             "technical_design": self.state.technical_design_created,
-    #             "user_stories": self.state.user_stories_created,
-    #             "module_name": self.state.module_name,
-    #             "class_name": self.state.class_name,
-    #             })
-    #     )
-
-    #     print(f"{be_icon} {be_agent_name} Backend module implemented {be_icon}", result.raw)
-    #     self.state.backend_module_implemented = result.raw
-
-
-    # @listen(implement_backend_module)
-    # def save_backend_module(self):
-    #     self._save_code_to_file(
-    #         self.state.backend_module_implemented, 
-    #         f"{self.state.module_name}.py", 
-    #         "backend module"
-    #     )
-
-    # @listen(implement_backend_module)
-    # def implement_frontend_module(self):
-    #     fe_icon = "💀💀💀💀💀💀💀💀"
-    #     fe_agent_name = f"Frontend Dev Skull Master"
-    #     print(f"{fe_icon} {fe_agent_name} Implementing frontend module {fe_icon}")
-    #     result = (
-    #         FrontEndSkullMaster()
-    #         .crew()
-    #         .kickoff(inputs={
-    #             "backend_module": self.state.backend_module_implemented,
-    #             "technical_design": self.state.technical_design_created,
-    #             "user_stories": self.state.user_stories_created,
-    #             "module_name": self.state.module_name,
-    #             "class_name": self.state.class_name,
-    #             })
-    #     )
-
-    #     print(f"{fe_icon} {fe_agent_name} Frontend module implemented {fe_icon}", result.raw)
-    #     self.state.frontend_module_implemented = result.raw
-
-    # @listen(implement_frontend_module)
-    # def save_frontend_module(self):
-    #     self._save_code_to_file(
-    #         self.state.frontend_module_implemented, 
-    #         "app.py", 
-    #         "frontend module"
-    #     )
-
-    # @listen(save_frontend_module)
-    # def start_gradio_app(self):
-    #     app_icon = "🚀🚀🚀🚀🚀🚀🚀🚀"
-    #     print(f"{app_icon} Starting Gradio app server {app_icon}")
+    # Where generated modules are written; created once by the entry points
+    OUTPUT_DIR = "src/crew_generated/engineering"
+
+    async def _run_stage(self, name: str):
+        """Kick off the crew for STAGES[name] and store its output on the state."""
+        stage = STAGES[name]
+        logger.info("%s %s %s %s", stage.icon, stage.agent_name, stage.start_message, stage.icon)
+        result = await cached_kickoff(
+            stage.crew_class(),
+            {key: getattr(self.state, field) for key, field in stage.inputs.items()},
+            output_file=getattr(self.state, stage.output_file) if stage.output_file else None,
+        )
+
+        logger.info("%s %s %s %s", stage.icon, stage.agent_name, stage.done_message, stage.icon)
+        logger.debug("%s output:\n%s", stage.agent_name, result.raw)
+        setattr(self.state, stage.output, result.raw)
+        self._save_snapshot()
+
+    # Stages that wait on an LLM or the network are async so they never block
+    # the flow's event loop; sibling listeners (e.g. saving the backend while
+    # the frontend is generated) and concurrent flows overlap on one loop.
+    @start()
+    async def generate_user_stories(self, crewai_trigger_payload: dict = None):
+        self.state.requirements = read_doc(self.state.requirements_path)
+        await self._run_stage("generate_user_stories")
+
+    @listen(generate_user_stories)
+    async def create_technical_design(self):
+        await self._run_stage("create_technical_design")
+
+    @listen(create_technical_design)
+    async def implement_backend_module(self):
+        await self._run_stage("implement_backend_module")
+
+    # Fan-out after the backend: saving it runs alongside frontend generation.
+    # The frontend itself cannot start earlier, since its prompt embeds the
+    # generated backend code to match the real API.
+    @listen(implement_backend_module)
+    def save_backend_module(self):
+        self._save_code_to_file(
+            self.state.backend_module_implemented, 
+            f"{self.state.module_name}.py", 
+            "backend module"
+        )
+
+    @listen(implement_backend_module)
+    async def implement_frontend_module(self):
+        await self._run_stage("implement_frontend_module")
+
+    @listen(implement_frontend_module)
+    def save_frontend_module(self):
+        self._save_code_to_file(
+            self.state.frontend_module_implemented, 
+            "app.py", 
+            "frontend module"
+        )
+
+    # Fan-in: the app imports the backend module, so wait for both files
+    @listen(and_(save_backend_module, save_frontend_module))
+    async def start_gradio_app(self):
+        app_icon = "🚀🚀🚀🚀🚀🚀🚀🚀"
+        logger.info("%s Starting Gradio app server %s", app_icon, app_icon)
         
-    #     app_path = "src/crew_generated/engineering/app.py"
-    #     url = self.state.application_url
-    #     timeout = 15  # 15 seconds
+        app_path = f"{self.OUTPUT_DIR}/app.py"
+        url = self.state.application_url
+        timeout = 15  # 15 seconds
         
-    #     # Start the app in background
-    #     process = subprocess.Popen(
-    #         ["uv", "run", app_path],
-    #         stdout=subprocess.PIPE,
-    #         stderr=subprocess.PIPE,
-    #         text=True
-    #     )
+        # Start the app in background; its output is drained by tasks on the
+        # event loop so the app never stalls on a full pipe and the flow is
+        # never blocked reading it
+        process = await asyncio.create_subprocess_exec(
+            "uv", "run", app_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_tail = deque(maxlen=200)
+        output_tasks = [
+            asyncio.create_task(_drain_stream(process.stdout)),
+            asyncio.create_task(_drain_stream(process.stderr, stderr_tail)),
+        ]
+        _background_tasks.update(output_tasks)
+        for task in output_tasks:
+            task.add_done_callback(_background_tasks.discard)
         
-    #     print(f"  - Process started with PID: {process.pid}")
-    #     print(f"  - Waiting for server to be ready at {url}...")
-    #     # Wait for server to be ready
-    #     start_time = time.time()
-    #     while time.time() - start_time < timeout:
-    #         try:
-    #             response = requests.get(url, timeout=1)
-    #             if response.status_code == 200:
-    #                 print(f"✅ Gradio app is running at {url}")
-    #                 print(f"  - Server ready in {time.time() - start_time:.2f} seconds")
-    #                 print(f"  - Server will continue running in background")
-    #                 print(f"  - Proceeding to next step...")
-    #                 # Server is ready, proceed to next step without blocking
-    #                 return
-    #         except (requests.RequestException, Exception):
-    #             time.sleep(1)
+        logger.info("  - Process started with PID: %s", process.pid)
+        logger.info("  - Waiting for server to be ready at %s...", url)
+        # Wait for server to be ready: probe the port with a cheap TCP connect,
+        # backing off exponentially, and only send an HTTP request once it accepts.
+        # One client for the whole wait keeps the connection alive between probes.
+        parsed_url = urlsplit(url)
+        host, port = parsed_url.hostname, parsed_url.port or 80
+        start_time = time.time()
+        delay = 0.05
+        async with httpx.AsyncClient(timeout=1) as client:
+            while time.time() - start_time < timeout:
+                if await _port_accepting(host, port):
+                    try:
+                        response = await client.get(url)
+                        if response.status_code == 200:
+                            logger.info("✅ Gradio app is running at %s", url)
+                            logger.info("  - Server ready in %.2f seconds", time.time() - start_time)
+                            logger.info("  - Server will continue running in background")
+                            logger.info("  - Proceeding to next step...")
+                            # Server is ready, proceed to next step without blocking
+                            return
+                    except (httpx.TransportError, OSError):
+                        # Not serving yet (refused, reset, timed out); anything else is a bug
+                        pass
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.3, 2.0)
         
-    #     # Timeout reached
-    #     print(f"❌ Server did not start within {timeout} seconds")
-    #     process.terminate()
-    #     stderr = process.stderr.read() if process.stderr else ""
-    #     if stderr:
-    #         print(f"Error output:\n{stderr}")
-    #     raise Exception(f"Failed to start Gradio server within {timeout} seconds")
+        # Timeout reached
+        logger.error("❌ Server did not start within %s seconds", timeout)
+        process.terminate()
+        await process.wait()
+        await asyncio.gather(*output_tasks)
+        if stderr_tail:
+            logger.error("Error output:\n%s", "\n".join(stderr_tail))
+        raise Exception(f"Failed to start Gradio server within {timeout} seconds")
     
-    # @listen(start_gradio_app)
-    # @start()
-    # def run_qa_testing(self):
-    #     self._load_context()
-    #     qa_icon = "👺👺👺👺👺👺👺👺"
-    #     qa_agent_name = "QA Lead - Evil Tester"
-    #     print(f"{qa_icon} {qa_agent_name} Creating comprehensive test plan {qa_icon}")
+    @listen(start_gradio_app)
+    async def run_qa_testing(self):
+        qa_icon = "👺👺👺👺👺👺👺👺"
+        qa_agent_name = "QA Lead - Evil Tester"
+        logger.info("%s %s Creating comprehensive test plan %s", qa_icon, qa_agent_name, qa_icon)
         
-    #     # Use relative path to seed file
-    #     seed_file_path = "e2e/seed.spec.ts"
-    #     print(f"  - Seed file path: {seed_file_path}")
+        # Use relative path to seed file
+        seed_file_path = "e2e/seed.spec.ts"
+        logger.info("  - Seed file path: %s", seed_file_path)
         
-    #     result = (
-    #         QaLeadEvil()
-    #         .crew()
-    #         .kickoff(inputs={
-    #             "application_url": self.state.application_url,
-    #             "user_stories": self.state.user_stories_created,
-    #             "seed_file_path": seed_file_path,
-    #             "module_name": self.state.module_name,
-    #             })
-    #     )        
+        # All stories go out in one structured-output call rather than one per story
+        preamble, stories = split_user_stories(self.state.user_stories_created)
+        story_ids = [story_id for story_id, _ in stories]
+        logger.info("  - Batching %d user stories into one test plan request", len(stories))
+        # The document-wide sections apply to every story, so they go along as shared context
+        batch = [f"<CONTEXT>\n{preamble}\n</CONTEXT>"] if preamble else []
+        batch += [f'<STORY id="{story_id}">\n{text}\n</STORY>' for story_id, text in stories]
+
+        from scrum_team.crews.qa_lead_evil.qa_lead_evil import QaLeadEvil
+
+        # Building the crew may start the shared Playwright MCP server, which
+        # blocks for up to its startup timeout, so keep it off the event loop
+        qa_crew = await asyncio.to_thread(lambda: QaLeadEvil().crew())
+        result = await _gated_kickoff(
+            qa_crew,
+            {
+                "application_url": self.state.application_url,
+                "user_stories": "\n\n".join(batch),
+                "story_ids": ", ".join(story_ids),
+                "seed_file_path": seed_file_path,
+                "module_name": self.state.module_name,
+            },
+        )
         
-    #     # Store both structured and raw outputs
-    #     self.state.test_plan_structured = result.pydantic
-    #     self.state.test_plan_created = result.raw
+        # The raw JSON is already on disk at test_plan_path; keep only the parsed plan.
+        # output_pydantic normally validates it; if CrewAI could not, validate the
+        # raw JSON once here rather than asking the LLM to convert it again.
+        plan = result.pydantic
+        if plan is None and result.raw:
+            raw = result.raw.strip().removeprefix("```json").removesuffix("```")
+            try:
+                plan = TestPlanStructured.model_validate_json(raw)
+            except ValidationError as e:
+                logger.warning("  - Test plan output is not a valid TestPlanStructured: %s", e)
+        self.state.test_plan_structured = plan
+        self._save_snapshot()
         
-    #     num_scenarios = len(self.state.test_plan_structured.scenarios) if self.state.test_plan_structured else 0
-    #     print(f"{qa_icon} {qa_agent_name} Test plan created with {num_scenarios} scenarios {qa_icon}")
+        num_scenarios = len(self.state.test_plan_structured.scenarios) if self.state.test_plan_structured else 0
+        logger.info("%s %s Test plan created with %d scenarios %s", qa_icon, qa_agent_name, num_scenarios, qa_icon)
+        # A document without story headings has no ids to check coverage against
+        if self.state.test_plan_structured and story_ids != [ALL_STORIES_ID]:
+            covered = {scenario.source_user_story_id for scenario in self.state.test_plan_structured.scenarios}
+            missing = [story_id for story_id in story_ids if story_id not in covered]
+            if missing:
+                logger.warning("  - No scenarios for %s", ", ".join(missing))
 
-    # @listen(run_qa_testing)
-    @start()
-    def generate_playwright_tests(self):
-        self._load_context()
+    @listen(run_qa_testing)
+    async def generate_playwright_tests(self):
         pw_icon = "🎃🎃🎃🎃🎃🎃🎃🎃"
         pw_agent_name = "Playwright QA Demon"
-        print(f"\n{pw_icon} {pw_agent_name} Generating Playwright test scripts {pw_icon}")
+        logger.info("%s %s Generating Playwright test scripts %s", pw_icon, pw_agent_name, pw_icon)
         
         if not self.state.test_plan_structured or not self.state.test_plan_structured.scenarios:
-            print("⚠️  No test scenarios found in structured test plan. Skipping test generation.")
+            logger.warning("⚠️  No test scenarios found in structured test plan. Skipping test generation.")
             return
         
         seed_file_path = "e2e/seed.spec.ts"
         total_scenarios = len(self.state.test_plan_structured.scenarios)
-        max_scenarios = min(2, total_scenarios)  # Limit to first 2 scenarios
+        max_scenarios = min(self.state.max_scenarios, total_scenarios)
         
-        print(f"  - Application URL: {self.state.application_url}")
-        print(f"  - Seed File: {seed_file_path}")
-        print(f"  - Total Scenarios: {total_scenarios} (generating first {max_scenarios})\n")
+        logger.info("  - Application URL: %s", self.state.application_url)
+        logger.info("  - Seed File: %s", seed_file_path)
+        logger.info("  - Total Scenarios: %d (generating first %d)", total_scenarios, max_scenarios)
         
-        # Iterate through first 2 test scenarios only
-        for idx, scenario in enumerate(self.state.test_plan_structured.scenarios[:max_scenarios], 1):
-            print(f"  [{idx}/{total_scenarios}] Generating test for: {scenario.test_id} - {scenario.title}")
-            
-            # Convert scenario to JSON for agent
-            scenario_json = json.dumps(scenario.model_dump(), indent=2)
-            
-            try:
-                result = (
-                    PlaywrightQaDemon()
-                    .crew()
-                    .kickoff(inputs={
+        from scrum_team.crews.playwright_qa_demon.playwright_qa_demon import PlaywrightQaDemon
+
+        # Scenarios are independent, so generate them concurrently; the semaphore
+        # caps how many crews hit the LLM (and the shared browser) at once.
+        semaphore = asyncio.Semaphore(self.state.max_parallel_generations)
+
+        async def generate_one(idx, scenario):
+            async with semaphore:
+                logger.info("  [%d/%d] Generating test for: %s - %s", idx, total_scenarios, scenario.test_id, scenario.title)
+
+                # Convert scenario to JSON for agent; compact output straight
+                # from pydantic-core, the prompt does not need it pretty-printed
+                scenario_json = scenario.model_dump_json()
+
+                # One crew per scenario on purpose: concurrent kickoffs cannot
+                # share a Crew's tasks and agents, and CrewAI stops the crew's
+                # MCP adapter after each kickoff. Its LLM is already shared
+                # (scrum_team.llms) and the MCP server is started once.
+                # Built on a worker thread: connecting the MCP adapter (and
+                # starting the server the first time) blocks.
+                pw_crew = await asyncio.to_thread(lambda: PlaywrightQaDemon().crew())
+                await _gated_kickoff(
+                    pw_crew,
+                    {
                         "application_url": self.state.application_url,
                         "seed_file": seed_file_path,
                         "test_scenario": scenario_json,
-                    })
+                    },
                 )
-                
-                self.state.playwright_tests_generated.append(scenario.test_id)
-                print(f"      ✅ Generated: {scenario.test_id}\n")
-                
-            except Exception as e:
-                print(f"      ❌ Failed to generate {scenario.test_id}: {str(e)}\n")
-                continue
-        
-        print(f"\n{pw_icon} Completed: {len(self.state.playwright_tests_generated)}/{max_scenarios} tests generated (limited to first 2 scenarios) {pw_icon}")
+
+        # Only the first max_scenarios test scenarios. Each result is recorded as soon as its
+        # crew finishes rather than after the slowest one.
+        pending = {
+            asyncio.create_task(generate_one(idx, scenario)): scenario
+            for idx, scenario in enumerate(self.state.test_plan_structured.scenarios[:max_scenarios], 1)
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    scenario = pending.pop(task)
+                    if task.exception() is None:
+                        self.state.playwright_tests_generated.append(scenario.test_id)
+                        logger.info("      ✅ Generated: %s", scenario.test_id)
+                    else:
+                        logger.error("      ❌ Failed to generate %s: %s", scenario.test_id, task.exception())
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.info("%s Completed: %d/%d tests generated (limited to first %d scenarios) %s", pw_icon, len(self.state.playwright_tests_generated), max_scenarios, max_scenarios, pw_icon)
     
     def _save_code_to_file(self, content, filename, log_description):
-        print(f"💾 Saving {log_description} to file...")
+        logger.info("💾 Saving %s to file...", log_description)
         
         # 1. Remove "Thought:" blocks (common in ReAct agents)
         # Handles single line or multi-line thoughts if they are clearly marked
-        content = re.sub(r'^Thought:.*$', '', content, flags=re.MULTILINE)
+        content = _THOUGHT_RE.sub('', content)
         
         # 2. Extract code from markdown fences if present
-        # Matches ```python ... ``` or ``` ... ```
-        code_block_pattern = r"```(?:python|py)?\s*(.*?)```"
-        match = re.search(code_block_pattern, content, re.DOTALL | re.IGNORECASE)
+        match = _FENCE_RE.search(content)
         if match:
-            print("  - Found markdown code block, extracting content...")
+            logger.info("  - Found markdown code block, extracting content...")
             content = match.group(1)
             
         # 3. Clean up common conversational fillers at the start
         content = content.strip()
-        lines = content.split('\n')
-        start_idx = 0
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if not stripped:
-                continue
-            
-            # Skip lines starting with "Thought:" (in case regex missed it or it's inside the block)
-            if stripped.startswith("Thought:"):
-                continue
-                
-            # Skip filename outputs like "filename.py"
-            if stripped.endswith(".py") and len(stripped.split()) == 1:
-                continue
+        start = _LEADING_FILLER_RE.match(content).end()
+        # Nothing but filler: keep it all rather than writing an empty file
+        if start >= len(content):
+            start = 0
 
-            # If line starts with import, from, class, def, @, or """, it's likely code
-            if stripped.startswith(('import ', 'from ', 'class ', 'def ', '@', '"""', "'''", '#')):
-                start_idx = i
-                break
-            
-            # If line looks like conversation, keep skipping
-            if stripped.lower().startswith(('here is', 'sure', 'the code', 'below is', 'i have', 'creating', 'implementing')):
-                continue
-            
-            # If we hit something else, assume it's code (or we can't tell)
-            start_idx = i
-            break
-            
-        content = "\n".join(lines[start_idx:])
-        
-        # Create the output directory if it doesn't exist
-        output_dir = "src/crew_generated/engineering"
-        os.makedirs(output_dir, exist_ok=True)
+        # Write to file (OUTPUT_DIR is created by kickoff / run_with_trigger_async).
+        # Write a temp file and rename it over the target so the Gradio launch
+        # (or anything else reading the module) never sees a half-written file.
+        output_path = f"{self.OUTPUT_DIR}/{filename}"
+        tmp_path = f"{output_path}.tmp"
+        Path(tmp_path).write_text(content[start:] + "\n", encoding="utf-8")
+        os.replace(tmp_path, output_path)
         
-        # Write to file
-        output_path = f"{output_dir}/{filename}"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        
-        print(f"✅ {log_description} saved to {output_path}")
-
-    def _load_context(self):
-        requirements_path = "docs/requirements.md"
-        if os.path.exists(requirements_path):
-            print(f"Loading requirements from {requirements_path}")
-            with open(requirements_path, "r", encoding="utf-8") as f:
-                self.state.requirements = f.read()
-        else:
-            print(f"File not found: {requirements_path}")
-
-        user_stories_path = "docs/crew/trading_simulation_user_stories.md"
-        if os.path.exists(user_stories_path):
-            print(f"Loading user stories from {user_stories_path}")
-            with open(user_stories_path, "r", encoding="utf-8") as f:
-                self.state.user_stories_created = f.read()
-        else:
-            print(f"File not found: {user_stories_path}")
-
-        technical_design_path = "docs/crew/trading_simulation_technical_design.md"
-        if os.path.exists(technical_design_path):
-            print(f"Loading technical design from {technical_design_path}")
-            with open(technical_design_path, "r", encoding="utf-8") as f:
-                self.state.technical_design_created = f.read()
-        else:
-            print(f"File not found: {technical_design_path}")
-
-        test_plan_path = "docs/crew/trading_simulation_test_plan.json"
-        if os.path.exists(test_plan_path):
-            print(f"Loading test plan from {test_plan_path}")
-            with open(test_plan_path, "r", encoding="utf-8") as f:
-                test_plan_data = json.load(f)
-                self.state.test_plan_created = json.dumps(test_plan_data, indent=2)
-                self.state.test_plan_structured = TestPlanStructured(**test_plan_data)
-            print(f"  - Loaded {len(self.state.test_plan_structured.scenarios)} test scenarios")
-        else:
-            print(f"File not found: {test_plan_path}")
+        logger.info("✅ %s saved to %s", log_description, output_path)
+
+    # Stage outputs kept in the on-disk snapshot; config fields (paths, limits)
+    # always come from the current run
+    SNAPSHOT_FIELDS = (
+        "requirements",
+        "user_stories_created",
+        "technical_design_created",
+        "backend_module_implemented",
+        "frontend_module_implemented",
+        "test_plan_structured",
+    )
+
+    def _save_snapshot(self):
+        try:
+            state_snapshot.save(self.state, self.SNAPSHOT_FIELDS)
+        except OSError as e:
+            logger.warning("Could not save state snapshot: %s", e)
+
+    def _restore_snapshot(self) -> bool:
+        """Fill empty state fields from the last run's snapshot if no doc changed since."""
+        snapshot = state_snapshot.load_if_fresh(
+            type(self.state),
+            [
+                self.state.requirements_path,
+                self.state.user_stories_path,
+                self.state.technical_design_path,
+                self.state.test_plan_path,
+            ],
+        )
+        if snapshot is None:
+            return False
+        for field in self.SNAPSHOT_FIELDS:
+            if not getattr(self.state, field):
+                setattr(self.state, field, getattr(snapshot, field))
+        logger.info("Restored state from %s", state_snapshot.snapshot_path())
+        return True
 
+    async def _load_context(self):
+        """Load the docs written by earlier stages, reading all of them concurrently.
+
+        Fields the state already holds (e.g. a flow kicked off with inputs, or
+        one that ran earlier stages) are kept and their files are not read.
+        Reads and the test plan parse are cached per file mtime, so repeated
+        kickoffs in one process only touch disk for files that changed.
+        """
+        # (label, path, state field, loader)
+        sources = [
+            ("requirements", self.state.requirements_path, "requirements", _read_doc_if_exists),
+            ("user stories", self.state.user_stories_path, "user_stories_created", _read_doc_if_exists),
+            ("technical design", self.state.technical_design_path, "technical_design_created", _read_doc_if_exists),
+            ("test plan", self.state.test_plan_path, "test_plan_structured", _load_test_plan_if_exists),
+        ]
+        sources = [source for source in sources if not getattr(self.state, source[2])]
+        if not sources:
+            logger.info("Context already loaded, skipping file reads")
+            return
+
+        # to_thread runs on the loop's default thread pool, so the reads overlap
+        contents = await asyncio.gather(
+            *(asyncio.to_thread(loader, path) for _, path, _, loader in sources)
+        )
+        for (label, path, field, _), content in zip(sources, contents):
+            if content is None:
+                logger.warning("File not found: %s", path)
+                continue
+            logger.info("Loading %s from %s", label, path)
+            setattr(self.state, field, content)
+            if field == "test_plan_structured":
+                logger.info("  - Loaded %d test scenarios", len(content.scenarios))
 
 def kickoff():
     """Run the full development workflow"""
+    configure_logging()
+    os.makedirs(ScrumFlow.OUTPUT_DIR, exist_ok=True)
     scrum_flow = ScrumFlow()
-    scrum_flow.kickoff()
+    asyncio.run(scrum_flow.kickoff_async())
+
+async def _run_qa(scrum_flow):
+    # The snapshot holds already-parsed stage outputs; _load_context then only
+    # reads whatever it did not cover
+    scrum_flow._restore_snapshot()
+    await scrum_flow._load_context()
+    await scrum_flow.run_qa_testing()
+    await scrum_flow.generate_playwright_tests()
 
 def kickoff_qa():
     """Run only QA testing workflow"""
-    scrum_flow = ScrumFlow()
-    scrum_flow.run_qa_testing()
+    configure_logging()
+    asyncio.run(_run_qa(ScrumFlow()))
 
 def plot():
     scrum_flow = ScrumFlow()
     scrum_flow.plot("scrum_flow.html")
 
+def _loads_json(text: str):
+    """Parse a JSON payload, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def run_with_trigger():
     """
     Run the flow with trigger payload.
     """
-    import json
-    import sys
+    configure_logging()
 
     # Get trigger payload from command line argument
     if len(sys.argv) < 2:
         raise Exception("No trigger payload provided. Please provide JSON payload as argument.")
 
     try:
-        trigger_payload = json.loads(sys.argv[1])
-    except json.JSONDecodeError:
+        trigger_payload = _loads_json(sys.argv[1])
+    except ValueError:
         raise Exception("Invalid JSON payload provided as argument")
 
+    return asyncio.run(run_with_trigger_async(trigger_payload))
+
+# Window in which a repeated trigger payload (e.g. a redelivered queue message)
+# returns the stored result; SCRUM_TRIGGER_IDEMPOTENCY_TTL=0 disables it
+TRIGGER_IDEMPOTENCY_TTL = 10 * 60
+
+
+async def run_with_trigger_async(trigger_payload: dict):
+    """
+    Run the flow with a trigger payload on the caller's event loop, so a server
+    can serve many triggers from one loop instead of a thread per request.
+
+    A payload identical to one that finished within the last
+    SCRUM_TRIGGER_IDEMPOTENCY_TTL seconds (e.g. a retried queue message), against
+    unchanged requirements, returns the stored result without re-running the
+    pipeline. Results come back JSON-normalized on both paths.
+    """
     # Create flow and kickoff with trigger payload
     # The @start() methods will automatically receive crewai_trigger_payload parameter
     poem_flow = ScrumFlow()
 
+    # Key on the payload and the requirements it will be run against, so an
+    # edited requirements doc re-runs the pipeline even for a repeated payload
+    requirements = await asyncio.to_thread(_read_doc_if_exists, poem_flow.state.requirements_path) or ""
+    requirements_digest = hashlib.blake2b(requirements.encode("utf-8"), digest_size=20).hexdigest()
+    idempotency_key = result_cache.cache_key("run_with_trigger", trigger_payload, requirements_digest)
+    idempotency_ttl = float(os.getenv("SCRUM_TRIGGER_IDEMPOTENCY_TTL", TRIGGER_IDEMPOTENCY_TTL))
+    stored = result_cache.get(idempotency_key, ttl=idempotency_ttl)
+    if stored is not None:
+        logger.info("Trigger %s already processed, returning stored result", idempotency_key)
+        return json.loads(stored)
+
+    os.makedirs(ScrumFlow.OUTPUT_DIR, exist_ok=True)
+
     try:
-        result = poem_flow.kickoff({"crewai_trigger_payload": trigger_payload})
-        return result
+        result = await poem_flow.kickoff_async({"crewai_trigger_payload": trigger_payload})
     except Exception as e:
         raise Exception(f"An error occurred while running the flow with trigger: {e}")
 
+    # Return the stored JSON form on this path too, so a first run and a
+    # replay hand the caller the same type
+    stored = json.dumps(result, default=str)
+    result_cache.put(idempotency_key, stored, ttl=idempotency_ttl)
+    return json.loads(stored)
+
 if __name__ == "__main__":
     kickoff()
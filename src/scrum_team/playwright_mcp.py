@@ -0,0 +1,67 @@
+import atexit
+import os
+import socket
+import subprocess
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# One Playwright test MCP server per process, reached over SSE by every crew
+# that needs browser tools, instead of an npx cold start per agent.
+PLAYWRIGHT_MCP_HOST = "localhost"
+PLAYWRIGHT_MCP_PORT = int(os.getenv("PLAYWRIGHT_MCP_PORT", "3001"))
+STARTUP_TIMEOUT = 30
+
+_process: Optional[subprocess.Popen] = None
+_lock = threading.Lock()
+
+
+def _port_open() -> bool:
+    try:
+        with socket.create_connection((PLAYWRIGHT_MCP_HOST, PLAYWRIGHT_MCP_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def _stop() -> None:
+    if _process is not None and _process.poll() is None:
+        _process.terminate()
+        try:
+            _process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            _process.kill()
+
+
+def _ensure_server() -> None:
+    global _process
+    with _lock:
+        if _port_open():
+            return  # already ours, or started by another process/terminal
+        _process = subprocess.Popen(
+            ["npx", "playwright", "run-test-mcp-server", "--headless",
+             "--host", PLAYWRIGHT_MCP_HOST, "--port", str(PLAYWRIGHT_MCP_PORT)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        atexit.register(_stop)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not _port_open():
+            if _process.poll() is not None or time.monotonic() > deadline:
+                _stop()
+                raise RuntimeError(
+                    f"Playwright MCP server did not start on port {PLAYWRIGHT_MCP_PORT}"
+                )
+            time.sleep(0.2)
+
+
+def server_params() -> Dict[str, Any]:
+    """MCPServerAdapter params for the shared server, starting it on first use.
+
+    Set PLAYWRIGHT_MCP_URL to use a server managed outside this process.
+    """
+    url = os.getenv("PLAYWRIGHT_MCP_URL")
+    if not url:
+        _ensure_server()
+        url = f"http://{PLAYWRIGHT_MCP_HOST}:{PLAYWRIGHT_MCP_PORT}/sse"
+    return {"url": url, "transport": "sse"}
@@ -0,0 +1,87 @@
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from crewai.utilities.paths import db_storage_path
+
+# Off unless SCRUM_RESULT_CACHE_TTL (seconds) is set: a hit replays old LLM output
+DEFAULT_TTL_SECONDS = 0
+
+
+@dataclass
+class CachedCrewOutput:
+    """Stands in for a CrewOutput on a cache hit; the flow only reads .raw."""
+    raw: str
+    pydantic: None = None
+
+
+def _ttl() -> float:
+    return float(os.getenv("SCRUM_RESULT_CACHE_TTL", DEFAULT_TTL_SECONDS))
+
+
+def _connect() -> sqlite3.Connection:
+    path = os.getenv("SCRUM_RESULT_CACHE_PATH") or str(Path(db_storage_path()) / "scrum_result_cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, raw TEXT NOT NULL, created REAL NOT NULL)"
+    )
+    return conn
+
+
+def crew_fingerprint(crew_class: type) -> str:
+    """Digest of what shapes a crew's output besides its inputs.
+
+    Covers the crew module (agents, tools and its gemini_llm model/sampling
+    settings) and its agents/tasks YAML, so editing a prompt or switching
+    models misses the cache instead of replaying the old result.
+    """
+    module_path = Path(inspect.getfile(crew_class))
+    paths = [module_path] + [
+        module_path.parent / getattr(crew_class, attr, default)
+        for attr, default in (
+            ("original_agents_config_path", "config/agents.yaml"),
+            ("original_tasks_config_path", "config/tasks.yaml"),
+        )
+    ]
+    digest = hashlib.blake2b(digest_size=20)
+    for path in paths:
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def cache_key(crew_name: str, inputs: Dict[str, Any], fingerprint: str = "") -> str:
+    """Key a kickoff on the crew, its config fingerprint and its exact inputs (which embed the source docs)."""
+    payload = json.dumps([crew_name, fingerprint, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+def get(key: str, ttl: Optional[float] = None) -> Optional[str]:
+    """Stored text for key if younger than ttl (default SCRUM_RESULT_CACHE_TTL)."""
+    ttl = _ttl() if ttl is None else ttl
+    if ttl <= 0:
+        return None
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT raw, created FROM results WHERE key = ?", (key,)).fetchone()
+    if row is None or time.time() - row[1] >= ttl:
+        return None
+    return row[0]
+
+
+def put(key: str, raw: str, ttl: Optional[float] = None) -> None:
+    if (_ttl() if ttl is None else ttl) <= 0:
+        return
+    with closing(_connect()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, raw, created) VALUES (?, ?, ?)",
+            (key, raw, time.time()),
+        )
@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Type, TypeVar
+
+from crewai.utilities.paths import db_storage_path
+from pydantic import BaseModel, ValidationError
+
+StateT = TypeVar("StateT", bound=BaseModel)
+
+
+def snapshot_path() -> Path:
+    return Path(os.getenv("SCRUM_STATE_SNAPSHOT_PATH") or Path(db_storage_path()) / "scrum_state_snapshot.json")
+
+
+def save(state: BaseModel, fields: Iterable[str]) -> None:
+    """Write the given state fields as JSON, replacing the previous snapshot atomically."""
+    path = snapshot_path()
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(state.model_dump_json(include=set(fields)), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_if_fresh(state_cls: Type[StateT], sources: Iterable[str]) -> Optional[StateT]:
+    """Return the saved state if it is newer than every existing source file.
+
+    Returns None when there is no snapshot, it is stale (a doc was edited or
+    regenerated after it was written) or it no longer matches the state model.
+    """
+    path = snapshot_path()
+    try:
+        snapshot_mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    for source in sources:
+        try:
+            if os.stat(source).st_mtime > snapshot_mtime:
+                return None
+        except FileNotFoundError:
+            continue
+    try:
+        return state_cls.model_validate_json(path.read_bytes())
+    except ValidationError:
+        return None
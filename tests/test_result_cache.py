@@ -0,0 +1,42 @@
+import pytest
+
+from scrum_team import result_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRUM_RESULT_CACHE_PATH", str(tmp_path / "results.db"))
+    monkeypatch.delenv("SCRUM_RESULT_CACHE_TTL", raising=False)
+
+
+def test_cache_is_off_by_default():
+    key = result_cache.cache_key("PmDemonKingCrew", {"requirements": "x"})
+
+    result_cache.put(key, "stored")
+
+    assert result_cache.get(key) is None
+    assert result_cache.get(key, ttl=60) is None
+
+
+def test_put_then_get_round_trips_when_enabled(monkeypatch):
+    monkeypatch.setenv("SCRUM_RESULT_CACHE_TTL", "60")
+    key = result_cache.cache_key("PmDemonKingCrew", {"requirements": "x"})
+
+    result_cache.put(key, "stored")
+
+    assert result_cache.get(key) == "stored"
+    assert result_cache.get(result_cache.cache_key("PmDemonKingCrew", {"requirements": "y"})) is None
+    assert result_cache.get(result_cache.cache_key("PmDemonKingCrew", {"requirements": "x"}, "other")) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    monkeypatch.setenv("SCRUM_RESULT_CACHE_TTL", "60")
+    key = result_cache.cache_key("PmDemonKingCrew", {"requirements": "x"})
+    now = 1_000_000.0
+    monkeypatch.setattr(result_cache.time, "time", lambda: now)
+    result_cache.put(key, "stored")
+
+    now += 59
+    assert result_cache.get(key) == "stored"
+    now += 1
+    assert result_cache.get(key) is None
@@ -0,0 +1,66 @@
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "crew_generated" / "engineering"))
+
+from trading_simulation import ServiceResponse, TradingSimulation  # noqa: E402
+
+
+def _ledger_lengths(sim: TradingSimulation) -> set:
+    return {
+        len(column)
+        for column in (
+            sim._tx_ts, sim._tx_type, sim._tx_symbol,
+            sim._tx_qty, sim._tx_price, sim._tx_value,
+        )
+    }
+
+
+def test_initialize_beyond_int64_cents_fails_without_changing_state():
+    sim = TradingSimulation()
+
+    response = sim.initialize(1e17)
+
+    assert not response.success
+    assert not sim.initialized
+    assert sim.cash_balance == Decimal("0")
+    assert _ledger_lengths(sim) == {0}
+    assert sim.initialize(100.0).success
+
+
+def test_deposit_beyond_int64_cents_fails_and_ledger_stays_usable():
+    sim = TradingSimulation()
+    assert sim.initialize(1e16).success
+
+    response = sim.deposit(9.2e16)
+
+    assert not response.success
+    assert sim.cash_balance == Decimal("10000000000000000.00")
+    assert _ledger_lengths(sim) == {1}
+    assert len(sim.get_transactions_df()) == 1
+    assert sim.get_portfolio_metrics().cash_balance == Decimal("10000000000000000.00")
+
+
+def test_success_response_is_a_plain_service_response():
+    sim = TradingSimulation()
+    response = sim.initialize(100.0)
+    expected = ServiceResponse(success=True, message="Account initialized with a balance of $100.00.")
+
+    assert response == expected
+    assert repr(response) == repr(expected)
+    assert dict(response) == dict(expected)
+    assert response.model_dump_json() == expected.model_dump_json()
+
+
+def test_empty_frames_are_independent_between_calls():
+    sim = TradingSimulation()
+
+    for frame in (sim.get_holdings_df(), sim.get_transactions_df()):
+        frame.index.name = "row"
+        frame.columns.name = "field"
+
+    for frame in (sim.get_holdings_df(), sim.get_transactions_df()):
+        assert frame.empty
+        assert frame.index.name is None
+        assert frame.columns.name is None